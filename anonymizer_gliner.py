@@ -5,10 +5,16 @@ The evaluator expects anonymize(text) -> (anonymized_text, metadata) where
 metadata["entities"] is a list of dicts with:
   { start, end, label, text, replacement }
 so that deanonymize(anonymized_text, metadata) restores the original text.
+
+anonymize_batch(texts) returns the same pairs for a list of texts and lets
+the evaluator run model inference in batches.
 """
-from typing import Tuple, Dict, List, Any
+import contextlib
+from operator import itemgetter
+from typing import Tuple, Dict, List, Any, Optional
+import torch
 from gliner import GLiNER
-from labels.en import DESCRIPTION_LABEL_MAP
+from labels.en import DESCRIPTION_LABEL_MAP, LABELS_TUPLE
 
 
 class Anonymizer:
@@ -16,46 +22,125 @@ class Anonymizer:
     Only change MODEL_NAME and (optionally) LABEL_MAP above.
     """
 
-    def __init__(self, model_path = "urchade/gliner_multi_pii-v1"):
-        self.model = GLiNER.from_pretrained(model_path)
+    def __init__(self, model_path = "urchade/gliner_multi_pii-v1", quantize: bool = False,
+                 onnx_model_file: Optional[str] = None, cache_size: int = 0,
+                 device: Optional[str] = None, fp16: bool = False):
+        if device is None:
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+        device_type = torch.device(device).type
+        if quantize and device_type != "cpu":
+            raise ValueError("quantize is only supported on CPU; pass device='cpu'")
+        if fp16 and device_type != "cuda":
+            raise ValueError("fp16 is only supported on CUDA devices")
+        if onnx_model_file is not None:
+            if quantize:
+                raise ValueError("quantize applies to the PyTorch model; pass a quantized ONNX file instead")
+            if fp16:
+                raise ValueError("fp16 applies to the PyTorch model; pass an FP16 ONNX file instead")
+            # ONNX Runtime with full graph optimizations (fused attention/GELU/LayerNorm)
+            self.model = GLiNER.from_pretrained(model_path, map_location=device, load_onnx_model=True,
+                                                onnx_model_file=onnx_model_file)
+        else:
+            self.model = GLiNER.from_pretrained(model_path, map_location=device)
+        # Opt-in FP16 autocast (tensor cores) for the PyTorch model on GPU
+        self._fp16 = fp16
+        self._labels = LABELS_TUPLE
+        self._label_lookup = DESCRIPTION_LABEL_MAP.get
+        self._threshold = 0.5
+        # Opt-in LRU cache: text -> (anonymized_text, metadata). It keeps raw
+        # input texts (i.e. PII) in memory, so it is off by default.
+        self._cache: Dict[str, Tuple[str, Dict]] = {}
+        self._cache_size = cache_size
+        if quantize:
+            # int8 dynamic quantization of the Linear layers (CPU only)
+            self.model.model = torch.ao.quantization.quantize_dynamic(
+                self.model.model, {torch.nn.Linear}, dtype=torch.qint8
+            )
 
     def anonymize(self, text: str) -> Tuple[str, Dict]:
-        labels = list(DESCRIPTION_LABEL_MAP.keys())
-        preds = self.model.predict_entities(text, labels, threshold=0.5)
-        predicted_spans: List[Dict[str, Any]] = []
+        return self.anonymize_batch([text])[0]
+
+    def anonymize_batch(self, texts: List[str], batch_size: int = 8) -> List[Tuple[str, Dict]]:
+        if self._cache_size <= 0:
+            batch_preds = self._predict(texts, batch_size)
+            return [self._build(text, preds) for text, preds in zip(texts, batch_preds)]
+
+        # Resolve cache hits up front (storing new results may evict them),
+        # then only run the model on distinct texts that are not cached yet
+        found: Dict[str, Tuple[str, Dict]] = {}
+        missing: List[str] = []
+        for t in dict.fromkeys(texts):
+            cached = self._lookup(t)
+            if cached is None:
+                missing.append(t)
+            else:
+                found[t] = cached
+        if missing:
+            batch_preds = self._predict(missing, batch_size)
+            for text, preds in zip(missing, batch_preds):
+                found[text] = self._build(text, preds)
+                self._remember(text, found[text])
+        return [self._copy(found[t]) for t in texts]
+
+    def _predict(self, texts: List[str], batch_size: int) -> List[List[Dict[str, Any]]]:
+        """Run GLiNER on texts, under FP16 autocast only when fp16 was requested."""
+        autocast = torch.autocast("cuda", dtype=torch.float16) if self._fp16 else contextlib.nullcontext()
+        with torch.inference_mode(), autocast:
+            return self.model.run(texts, self._labels, threshold=self._threshold, batch_size=batch_size)
+
+    def _lookup(self, text: str) -> Optional[Tuple[str, Dict]]:
+        """Return the cached result for text and mark it most recently used."""
+        result = self._cache.pop(text, None)
+        if result is not None:
+            self._cache[text] = result
+        return result
+
+    def _remember(self, text: str, result: Tuple[str, Dict]) -> None:
+        """Store a result, evicting the least recently used entry when full."""
+        if len(self._cache) >= self._cache_size:
+            del self._cache[next(iter(self._cache))]
+        self._cache[text] = result
+
+    @staticmethod
+    def _copy(result: Tuple[str, Dict]) -> Tuple[str, Dict]:
+        """Hand out fresh metadata so callers cannot modify cached entries."""
+        anon_text, metadata = result
+        return anon_text, {"entities": [dict(ent) for ent in metadata["entities"]]}
+
+    def _build(self, text: str, preds: List[Dict[str, Any]]) -> Tuple[str, Dict]:
+        """Turn raw model predictions into the anonymized text and metadata."""
+        label_lookup = self._label_lookup
+        predicted_spans: List[Tuple[int, int, str]] = []
         for p in preds:
             s = int(p.get("start", 0))
             e = int(p.get("end", 0))
-            word = p.get("text", "")
-            label = DESCRIPTION_LABEL_MAP.get(p.get("label", ""), "")
             if e > s:
-                predicted_spans.append({
-                    "start": s,
-                    "end": e,
-                    "label": label,
-                    "text": word if word else text[s:e],
-                })
+                predicted_spans.append((s, e, label_lookup(p.get("label", ""), "")))
 
-        predicted_spans.sort(key=lambda s: s["start"])  # left-to-right
+        if not predicted_spans:
+            return text, {"entities": []}
+
+        predicted_spans.sort(key=itemgetter(0))  # left-to-right
 
         # Build anonymized text with placeholders and metadata
         parts: List[str] = []
-        cursor = 0
         entities_meta: List[Dict[str, Any]] = []
-        for idx, span in enumerate(predicted_spans, start=1):
-            s, e, label = span["start"], span["end"], span["label"]
+        parts_append = parts.append
+        meta_append = entities_meta.append
+        cursor = 0
+        for idx, (s, e, label) in enumerate(predicted_spans, start=1):
             placeholder = f"<{label}_{idx}>"
-            parts.append(text[cursor:s])
-            parts.append(placeholder)
+            parts_append(text[cursor:s])
+            parts_append(placeholder)
             cursor = e
-            entities_meta.append({
+            meta_append({
                 "start": s,
                 "end": e,
                 "label": label,
                 "text": text[s:e],
                 "replacement": placeholder,
             })
-        parts.append(text[cursor:])
+        parts_append(text[cursor:])
         anon_text = "".join(parts)
         metadata = {"entities": entities_meta}
         return anon_text, metadata
@@ -34,13 +34,13 @@ def detokenize_with_offsets(tokens: List[str], space_after: List[bool]) -> Tuple
     text_parts: List[str] = []
     spans: List[Tuple[int, int]] = []
     cursor = 0
+    last = len(tokens) - 1
     for i, tok in enumerate(tokens):
-        start = cursor
+        end = cursor + len(tok)
+        spans.append((cursor, end))
         text_parts.append(tok)
-        cursor += len(tok)
-        end = cursor
-        spans.append((start, end))
-        if i < len(tokens) - 1 and space_after[i]:
+        cursor = end
+        if i < last and space_after[i]:
             text_parts.append(" ")
             cursor += 1
     text = "".join(text_parts)
@@ -52,23 +52,31 @@ def bio2_to_spans(tokens: List[str], tags: List[str], space_after: List[bool]) -
     Returns list of dicts: {start, end, label, text}
     """
     text, tok_spans = detokenize_with_offsets(tokens, space_after)
+    return bio2_offsets_to_spans(text, tok_spans, tags)
+
+
+def bio2_offsets_to_spans(text: str, tok_spans: List[Tuple[int, int]], tags: List[str]) -> List[Dict[str, Any]]:
+    """Same as bio2_to_spans, but for text and token offsets that were already
+    computed with detokenize_with_offsets.
+    """
     spans: List[Dict[str, Any]] = []
+    n = len(tags)
     i = 0
-    while i < len(tokens):
+    while i < n:
         tag = tags[i]
         if tag.startswith("B-"):
             label = tag[2:]
+            inside = "I-" + label
             start_char = tok_spans[i][0]
             j = i + 1
-            while j < len(tokens) and tags[j].startswith("I-") and tags[j][2:] == label:
+            while j < n and tags[j] == inside:
                 j += 1
             end_char = tok_spans[j - 1][1]
-            surface = text[start_char:end_char]
             spans.append({
                 "start": start_char,
                 "end": end_char,
                 "label": label,
-                "text": surface,
+                "text": text[start_char:end_char],
             })
             i = j
         else:
@@ -88,8 +96,8 @@ def load_dataset(path: str, limit: int | None = None) -> List[Dict[str, Any]]:
         tokens = ex["tokens"]
         tags = ex["ner_tags"]
         space_after = ex["space_after"]
-        text, _ = detokenize_with_offsets(tokens, space_after)
-        gold_spans = bio2_to_spans(tokens, tags, space_after)
+        text, tok_spans = detokenize_with_offsets(tokens, space_after)
+        gold_spans = bio2_offsets_to_spans(text, tok_spans, tags)
         examples.append({
             "text": text,
             "gold_spans": gold_spans,
@@ -103,9 +111,10 @@ def load_dataset(path: str, limit: int | None = None) -> List[Dict[str, Any]]:
 
 
 class Evaluator:
-    def __init__(self, client: Any, ignore_labels: bool = False):
+    def __init__(self, client: Any, ignore_labels: bool = False, batch_size: int = 8):
         self.client = client
         self.ignore_labels = ignore_labels
+        self.batch_size = batch_size
 
     def _to_tuple_set(self, spans: List[Dict[str, Any]]):
         if self.ignore_labels:
@@ -122,11 +131,25 @@ class Evaluator:
         deanonym_ok = 0
         total = 0
 
-        for ex in examples:
+        # Clients exposing anonymize_batch get all texts at once so the model
+        # can run batched inference; others are called one text at a time.
+        texts = [ex["text"] for ex in examples]
+        anonymize_batch = getattr(self.client, "anonymize_batch", None)
+        if anonymize_batch is not None:
+            # Batch texts of similar length together to cut padding, then
+            # put the results back in example order.
+            order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+            sorted_results = anonymize_batch([texts[i] for i in order], batch_size=self.batch_size)
+            results: List[Any] = [None] * len(texts)
+            for i, result in zip(order, sorted_results):
+                results[i] = result
+        else:
+            results = [self.client.anonymize(text) for text in texts]
+
+        for ex, (anon_text, metadata) in zip(examples, results):
             total += 1
             text = ex["text"]
             gold = ex["gold_spans"]
-            anon_text, metadata = self.client.anonymize(text)
 
             # Predicted spans expected in metadata["entities"]
             pred_spans = metadata.get("entities", []) if isinstance(metadata, dict) else []
@@ -170,6 +193,17 @@ def main():
     # --ignore-labels is only used on ronec original data because they use different labels
     parser.add_argument("--ignore-labels", action="store_true",
                         help="If set, evaluate spans ignoring labels (useful when label taxonomies differ)")
+    parser.add_argument("--batch-size", type=int, default=8, help="Batch size for model inference")
+    parser.add_argument("--quantize", action="store_true",
+                        help="If set, run the model with int8 dynamic quantization (CPU only)")
+    parser.add_argument("--onnx-model-file", type=str, default=None,
+                        help="ONNX file inside the model repo/directory to run with ONNX Runtime")
+    parser.add_argument("--device", type=str, default=None,
+                        help="Device to run the model on (default: cuda if available, else cpu)")
+    parser.add_argument("--fp16", action="store_true",
+                        help="If set, run the model under FP16 autocast (CUDA only)")
+    parser.add_argument("--num-threads", type=int, default=None,
+                        help="Torch intra-op threads for CPU inference (default: torch's own choice)")
     args = parser.parse_args()
 
     # Load data
@@ -178,10 +212,15 @@ def main():
         print("No examples loaded. Check the --data path.")
         return
 
+    if args.num_threads is not None:
+        import torch
+        torch.set_num_threads(args.num_threads)
+
     from anonymizer_gliner import Anonymizer
 
-    client = Anonymizer()
-    evaluator = Evaluator(client, ignore_labels=args.ignore_labels)
+    client = Anonymizer(quantize=args.quantize, onnx_model_file=args.onnx_model_file, device=args.device,
+                        fp16=args.fp16)
+    evaluator = Evaluator(client, ignore_labels=args.ignore_labels, batch_size=args.batch_size)
 
     # Evaluate
     metrics = evaluator.evaluate(examples)
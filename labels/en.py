@@ -41,4 +41,6 @@ DESCRIPTION_LABEL_MAP = {
   "client segment": "SEGMENT",
   "politically exposed person status": "EXPUS_POLITIC",
   "FATCA compliance status": "STATUT_FATCA"
-}
\ No newline at end of file
+}
+
+LABELS_TUPLE = tuple(DESCRIPTION_LABEL_MAP)  # descriptions passed to GLiNER
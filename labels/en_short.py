@@ -23,3 +23,5 @@ DESCRIPTION_LABEL_MAP = {
     "passport number": "PASAPORT",
     "contract number": "NUMAR_CONTRACT"
 }
+
+LABELS_TUPLE = tuple(DESCRIPTION_LABEL_MAP)  # descriptions passed to GLiNER
@@ -42,3 +42,5 @@ DESCRIPTION_LABEL_MAP = {
   "statut persoană expusă politic": "EXPUS_POLITIC",
   "statut conformitate FATCA": "STATUT_FATCA"
 }
+
+LABELS_TUPLE = tuple(DESCRIPTION_LABEL_MAP)  # descriptions passed to GLiNER
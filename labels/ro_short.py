@@ -23,3 +23,5 @@ DESCRIPTION_LABEL_MAP = {
     "număr de pașaport": "PASAPORT",
     "număr de contract": "NUMAR_CONTRACT"
 }
+
+LABELS_TUPLE = tuple(DESCRIPTION_LABEL_MAP)  # descriptions passed to GLiNER